@@ -5,12 +5,14 @@
 
 # Description: This script takes in the raw titanic datasets and clean it for
 #              future analyses. Cleaning includes removing un-need data, fill NaN elements
-#              and joined gender_submission.csv with test.csv
+#              and joined gender_submission.csv with test.csv. The cleaned data is written
+#              both as csv and as Parquet for the analysis step.
 
 # Usage: python 01_data_clean.py <train.csv path> <test.csv path> <gender_submission.csv path>
-#        <clean_train.csv path> <clean_test.csv path> <clean_total.csv path>
+#        <clean_train.csv path> <clean_test.csv path> <clean_train.parquet path> <clean_test.parquet path>
 # Example: python 01_data_clean.py data/raw/train.csv data/raw/test.csv data/raw/gender_submission.csv
 #          data/cleaned/cleaned_train.csv data/cleaned/cleaned_test.csv
+#          data/cleaned/cleaned_train.parquet data/cleaned/cleaned_test.parquet
 
 import argparse
 import pandas as pd
@@ -22,19 +24,26 @@ parser.add_argument('testing_data')
 parser.add_argument('gender_submission')
 parser.add_argument('cleaned_train')
 parser.add_argument("cleaned_test")
+parser.add_argument("cleaned_train_parquet")
+parser.add_argument("cleaned_test_parquet")
 args = parser.parse_args()
 
 def main():
-    # Read in raw data
-    titanic_train = pd.read_csv(args.training_data, index_col = 0)
-    titanic_test = pd.read_csv(args.testing_data, index_col = 0)
-    gender_submission = pd.read_csv(args.gender_submission, index_col = 0)
+    # Read in raw data, keeping only the columns we are interested in
+    # (each read only gets dtypes for its own columns; older pandas rejects unknown ones)
+    raw_columns = ["PassengerId", "Pclass", "Sex", "Age", "SibSp", "Parch", "Fare"]
+    dtypes = {"Pclass": np.int8, "SibSp": np.int8, "Parch": np.int8,
+              "Age": np.float32, "Fare": np.float32}
+    titanic_train = pd.read_csv(args.training_data, index_col = 0, engine = "pyarrow",
+                                usecols = raw_columns + ["Survived"], dtype = {**dtypes, "Survived": np.int8})
+    titanic_test = pd.read_csv(args.testing_data, index_col = 0, engine = "pyarrow",
+                               usecols = raw_columns, dtype = dtypes)
+    gender_submission = pd.read_csv(args.gender_submission, index_col = 0, engine = "pyarrow",
+                                    dtype = {"Survived": np.int8})
     print("Raw data imported")
 
-
-    # Drop columns that we are not interested in
-    titanic_train = titanic_train.loc[:,["Pclass", "Sex", "Age", "SibSp", "Parch", "Fare", "Survived"]]
-    titanic_test = titanic_test.loc[:,["Pclass", "Sex", "Age", "SibSp", "Parch", "Fare"]]
+    # Move Survived to the last column, after the features
+    titanic_train["Survived"] = titanic_train.pop("Survived")
 
     # Add Survived column to test data
     titanic_test = titanic_test.join(gender_submission)
@@ -47,22 +56,28 @@ def main():
     # Export data
     titanic_train.to_csv(args.cleaned_train)
     titanic_test.to_csv(args.cleaned_test)
+    titanic_train.to_parquet(args.cleaned_train_parquet, compression = "zstd")
+    titanic_test.to_parquet(args.cleaned_test_parquet, compression = "zstd")
     print("Clean data exported")
 
 # Calculate statistical center of "age" and "fare"
 def calcNAN(df):
-    return {'Age': df.Age.mean(), 'Fare': df.Fare.median()}
+    return {'Age': np.nanmean(df.Age.values), 'Fare': np.nanmedian(df.Fare.values)}
 
-# Replace NaN values in df with statistical center of column variable
+# Replace NaN values in df with statistical center of column variable,
+# writing the filled column out as float32
 def fillNAN(df):
     values = calcNAN(df[0])
     for i in df:
-        i.fillna(value=values, inplace = True)
+        for column, value in values.items():
+            arr = i[column].values.astype(np.float32)
+            arr[np.isnan(arr)] = value
+            i[column] = arr
 
 # Replace Sex to 1 or 0
 def process_sex(df):
     for i in df:
-        i["Sex"] = i["Sex"].map({"male": 1, "female": 0})
+        i["Sex"] = np.where(i["Sex"].values == "male", 1, 0).astype(np.int8)
 
 if __name__ == "__main__":
     main()
@@ -82,6 +97,7 @@ fillNAN([unit_train_df])
 assert unit_train_df.isnull().values.any() == False, 'NaN values not replaced'
 assert unit_train_df.Age[3] == np.mean(unit_train_df.Age), 'Age NaN value not replaced correctly'
 assert unit_train_df.Fare[1] == np.nanmedian(unit_train_df.Fare), 'Fare NaN value not replaced correctly'
+assert list(unit_train_df.dtypes[["Age", "Fare"]]) == [np.float32, np.float32], 'Age or Fare not stored as float32'
 
 # Unit test for process_sex()
 process_sex([unit_train_df])
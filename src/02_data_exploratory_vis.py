@@ -25,7 +25,7 @@ args = parser.parse_args()
 
 def main():
     # Import file
-    titanic_train = pd.read_csv(args.input_file, index_col = 0)
+    titanic_train = pd.read_csv(args.input_file, index_col = 0, engine = "pyarrow")
 
     survived = titanic_train.query("Survived == 1")
     died = titanic_train.query("Survived != 1")
@@ -9,8 +9,8 @@
 #              the value for hyperparameters. It then returns the top three
 #              most important features.
 
-# Usage: python 03_data_analysis.py <cleaned_train.csv path> <cleaned_test.csv path> <output_folder path/>
-# Example: python 03_data_analysis.py data/cleaned/cleaned_train.csv data/cleaned/cleaned_test.csv results/
+# Usage: python 03_data_analysis.py <cleaned_train.parquet path> <cleaned_test.parquet path> <output_folder path/>
+# Example: python 03_data_analysis.py data/cleaned/cleaned_train.parquet data/cleaned/cleaned_test.parquet results/
 
 # Load dependencies
 import argparse
@@ -18,8 +18,10 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 from sklearn.tree import DecisionTreeClassifier, export_graphviz
-from sklearn.model_selection import cross_val_score, KFold
+from sklearn.model_selection import GridSearchCV, KFold
 import pickle
+import hashlib
+import json
 import os.path
 
 # Parse input arguments
@@ -35,27 +37,47 @@ parser.add_argument('testing_data')
 parser.add_argument('output_folder')
 args = parser.parse_args()
 
+# Cross validation search setup. Trees on ~900 rows stop gaining accuracy
+# well before depth log2(n) ~ 10
+MAX_DEPTHS = range(1, 12)
+N_SPLITS = 10
+TREE_PARAMS = {"random_state": 1234}
+
 def main():
     # Read data
-    titanic_train = pd.read_csv(args.training_data, index_col = 0)
-    titanic_test = pd.read_csv(args.testing_data, index_col = 0)
+    titanic_train = pd.read_parquet(args.training_data)
+    titanic_test = pd.read_parquet(args.testing_data)
     print("Data Import Success")
 
     # Split data into feature and target dataframes
     Xtrain, ytrain = split_data(titanic_train)
     Xtest, ytest = split_data(titanic_test)
 
-    # Cross Validation to find the best max_depth for decision classification tree
-    best_depth, accuracies = calc_depth(Xtrain, ytrain)
+    # Convert features to float32 arrays once for cross validation, fitting and prediction
+    Xtrain_np = Xtrain.values.astype(np.float32)
+    Xtest_np = Xtest.values.astype(np.float32)
+
+    # Cross Validation to find the best max_depth for decision classification tree,
+    # reusing the cached result when the training data and search setup have not changed
+    cv_cache = cv_cache_path(Xtrain_np, ytrain)
+    if os.path.isfile(cv_cache):
+        with open(cv_cache) as f:
+            cv_results = json.load(f)
+        best_depth, accuracies = cv_results["best_depth"], cv_results["accuracies"]
+        print("CV Results Loaded From Cache")
+    else:
+        best_depth, accuracies = calc_depth(Xtrain_np, ytrain)
+        with open(cv_cache, "w") as f:
+            json.dump({"best_depth": int(best_depth), "accuracies": [float(a) for a in accuracies]}, f)
     create_cv_plot(accuracies)
 
     # Create decision tree and fit model
-    tree = DecisionTreeClassifier(max_depth=best_depth, random_state=1234)
-    tree.fit(Xtrain,ytrain)
+    tree = DecisionTreeClassifier(max_depth=best_depth, **TREE_PARAMS)
+    tree.fit(Xtrain_np, ytrain)
 
     # Predict using train and test set
-    predicted_train = predict(tree, Xtrain, titanic_train)
-    predicted_test = predict(tree, Xtest, titanic_test)
+    predicted_train = predict(tree, Xtrain_np, titanic_train)
+    predicted_test = predict(tree, Xtest_np, titanic_test)
 
     # Export predictions to csv
     pickle.dump(tree, open(args.output_folder + "model/decision_tree_model.sav", "wb"))
@@ -77,25 +99,39 @@ def split_data(data):
 
 def calc_depth(Xtrain,ytrain):
     """
-    Description: Find the best max_depth hyperparameter by 10-fold cross valiation
-    Parameter:   Xtrain(dataframe) = dataframe containing the training feature columns
+    Description: Find the best max_depth hyperparameter out of MAX_DEPTHS by N_SPLITS-fold cross valiation
+    Parameter:   Xtrain(array) = float32 array containing the training feature columns
                  ytrain(dataframe) = dataframe containing the training target column
     Return:      best_depth(integer) = the max_depth that gave the best accuracies
     """
-    max_depths = range(1, 50)
-
-    kfold = KFold(n_splits=10, random_state=1234)
+    # Generate the fold indices once and reuse them for every depth
+    folds = list(KFold(n_splits=N_SPLITS).split(Xtrain, ytrain))
 
-    accuracies = []
-    for depth in max_depths:
-        tree = DecisionTreeClassifier(max_depth=depth, random_state=1234)
-        cross_vals = cross_val_score(tree, Xtrain, ytrain, cv=kfold)
-        accuracies.append(cross_vals.mean())
+    grid = GridSearchCV(DecisionTreeClassifier(**TREE_PARAMS),
+                        {"max_depth": MAX_DEPTHS}, cv=folds, n_jobs=-1, refit=False)
+    grid.fit(Xtrain, ytrain)
 
-    best_depth = max_depths[np.argmax(accuracies)]
+    accuracies = list(grid.cv_results_["mean_test_score"])
+    best_depth = grid.best_params_["max_depth"]
 
     return(best_depth, accuracies)
 
+def cv_cache_path(Xtrain, ytrain, max_depths=MAX_DEPTHS, n_splits=N_SPLITS, tree_params=TREE_PARAMS):
+    """
+    Description: build the cache file path for the cross validation results of a training set
+    Parameter:   Xtrain(array) = float32 array containing the training feature columns
+                 ytrain(dataframe) = dataframe containing the training target column
+                 max_depths(range) = max_depth values searched, optional
+                 n_splits(integer) = number of cross validation folds, optional
+                 tree_params(dict) = fixed DecisionTreeClassifier parameters, optional
+    Return:      cv_cache(string) = path of a json file in the model/ output directory,
+                 named by a hash of the training data and the search setup
+    """
+    search_setup = repr((max_depths, n_splits, sorted(DecisionTreeClassifier(**tree_params).get_params().items())))
+    key = hashlib.blake2b(Xtrain.tobytes() + ytrain.values.tobytes() + search_setup.encode(),
+                          digest_size=16).hexdigest()
+    return(args.output_folder + "model/cv_" + key + ".json")
+
 def create_cv_plot(accuracies):
     """
     Description: Plot accuracies vs different values of max_depth hyperparameter
@@ -114,14 +150,12 @@ def predict(tree, feature_set, whole_set):
     """
     Description: predict targets from feature set using the classification tree
     Parameter:   tree(DecisionTreeClassifier object) = classification tree model
-                 feature_set(dataframe) = dataframe containing the feature columns
+                 feature_set(array) = float32 array (or dataframe) containing the feature columns
                  whole_set(dataframe) = dataframe containing the feature and target columns
     Return:      tree_predict(dataframe) = dataframe with an addition prediction column
                  appended to the whole_set dataframe
     """
-    predictions = tree.predict(feature_set)
-    tree_predict = whole_set.copy()
-    tree_predict["Prediction"] = predictions
+    tree_predict = whole_set.assign(Prediction = tree.predict(feature_set))
     return(tree_predict)
 
 
@@ -139,9 +173,18 @@ unit_train_df = pd.DataFrame({'Age': [1, 2, 3, 3, 5, 4, 5, 2, 5, 2], 'Fare': [7,
 unit_Xtrain, unit_ytrain = split_data(unit_train_df)
 assert unit_Xtrain.equals(unit_train_df.loc[:,"Age":"Fare"]), 'The data was split incorrectly.'
 assert unit_ytrain.equals(unit_train_df.Survived), 'The data was split incorrectly.'
+unit_Xtrain_np = unit_Xtrain.values.astype(np.float32)
 
 # Unit test for calc_depth()
-assert calc_depth(unit_Xtrain, unit_ytrain) == (1, [0.7, 0.7, 0.6, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4]) , 'The best depth is calculated incorrectly.'
+assert calc_depth(unit_Xtrain_np, unit_ytrain) == (1, [0.7, 0.7, 0.6, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4]) , 'The best depth is calculated incorrectly.'
+
+# Unit test for cv_cache_path()
+assert cv_cache_path(unit_Xtrain_np, unit_ytrain) == cv_cache_path(unit_Xtrain_np.copy(), unit_ytrain.copy()), 'Cache path differs for identical data'
+assert cv_cache_path(unit_Xtrain_np, unit_ytrain) != cv_cache_path(unit_Xtrain_np * 2, unit_ytrain), 'Cache path does not change with the data'
+assert cv_cache_path(unit_Xtrain_np, unit_ytrain) != cv_cache_path(unit_Xtrain_np, unit_ytrain, max_depths=range(1, 3)), 'Cache path does not change with the depth grid'
+assert cv_cache_path(unit_Xtrain_np, unit_ytrain) != cv_cache_path(unit_Xtrain_np, unit_ytrain, n_splits=5), 'Cache path does not change with the number of folds'
+assert cv_cache_path(unit_Xtrain_np, unit_ytrain) != cv_cache_path(unit_Xtrain_np, unit_ytrain, tree_params={"random_state": 1}), 'Cache path does not change with the tree parameters'
+assert cv_cache_path(unit_Xtrain_np, unit_ytrain).endswith(".json"), 'Cache path is not a json file'
 
 #Unit test for create_cv_plot()
 assert os.path.isfile("results/figure/CV_accuracy_score_lineplot.png"), 'CV_accuracy_score_lineplot does not exist.'
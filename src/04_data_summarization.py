@@ -30,14 +30,14 @@ args = parser.parse_args()
 def main():
     # Import data
     tree = pickle.load(open(args.tree_model, "rb"))
-    predicted_train = pd.read_csv(args.predicted_train_data, index_col = 0)
-    predicted_test = pd.read_csv(args.predicted_test_data, index_col = 0)
+    predicted_train = pd.read_csv(args.predicted_train_data, index_col = 0, engine = "pyarrow")
+    predicted_test = pd.read_csv(args.predicted_test_data, index_col = 0, engine = "pyarrow")
     print("Data Import Success")
 
     # Get accuracy scores
-    accuracies_df = pd.DataFrame(columns = ["set", "n_total", "n_correct_pred", "n_incorrect_pred", "accuracy"])
-    accuracies_df.loc[0] = get_accuracies(predicted_train, "train")
-    accuracies_df.loc[1] = get_accuracies(predicted_test, "test")
+    accuracies_df = pd.DataFrame([get_accuracies(predicted_train, "train"),
+                                  get_accuracies(predicted_test, "test")],
+                                 columns = ["set", "n_total", "n_correct_pred", "n_incorrect_pred", "accuracy"])
 
     # Export accuracy scores to csv
     accuracies_df.to_csv(args.output_folder + "accuracies.csv")
@@ -66,9 +66,11 @@ def get_accuracies(df, set_name):
                           total number of predicted samples(int), number of correct predictions(int),
                           number of incorrect predictions(int), prediction accuracy(float)
     """
-    correct_predictions = df.Survived[df.Survived == df.Prediction].count()
-    incorrect_predictions = df.Survived[df.Survived != df.Prediction].count()
-    total = correct_predictions + incorrect_predictions
+    survived = df.Survived.values
+    predictions = df.Prediction.values
+    total = survived.size
+    correct_predictions = int(np.sum(survived == predictions))
+    incorrect_predictions = total - correct_predictions
     accuracy = round(correct_predictions / total, 4)
     return([set_name, total, correct_predictions, incorrect_predictions, accuracy])
 
@@ -84,10 +86,9 @@ def feature_rank(tree, features):
     importances = tree.feature_importances_
     importance_indices = importances.argsort()[::-1]
 
-    feature_rank_df = pd.DataFrame(columns = ['Rank', 'Feature', 'Importance'])
-
-    for i in range(len(features)):
-        feature_rank_df.loc[i] = [i+1, features[importance_indices[i]], importances[importance_indices[i]]]
+    feature_rank_df = pd.DataFrame({'Rank': np.arange(1, len(features) + 1),
+                                    'Feature': np.asarray(features)[importance_indices],
+                                    'Importance': importances[importance_indices]})
 
     return(feature_rank_df)
 